@@ -1,10 +1,12 @@
-from typing import Optional, List
-import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, List
 from typing import Sequence
 
+from fast_json import loads as json_loads, dumps_str as json_dumps_str, JSONDecodeError
 from prompt_engineering import build_prompt
-from mcp_client import MCPClient
-from memory_client import store as mem_store
+from mcp_client import MCPPool
+from memory_writer import submit as mem_submit
 
 # Attempt to import LangChain. If unavailable, fall back to lightweight stubs so the
 # rest of the application and test-suite can operate without the heavy dependency.
@@ -29,17 +31,53 @@ except ModuleNotFoundError:  # pragma: no cover – optional dependency
             return self._run(query)
 
 
-# Global MCP client singleton
-_MCP_CLIENT = MCPClient()
-_MCP_CLIENT.connect()
+# Shared MCP connection pool, created lazily: a single client serializes all
+# concurrent MCP traffic behind one socket and one listener thread.
+_MCP_POOL: Optional[MCPPool] = None
+_MCP_POOL_LOCK = threading.Lock()
+
+
+def get_mcp_pool() -> MCPPool:
+    """Get or create the shared MCP connection pool."""
+    global _MCP_POOL
+    if _MCP_POOL is None:
+        with _MCP_POOL_LOCK:
+            if _MCP_POOL is None:
+                _MCP_POOL = MCPPool()
+    return _MCP_POOL
+
+
+# Serialised once; returned on every failed MCP round-trip.
+_MCP_UNAVAILABLE = json_dumps_str({"status": "error", "message": "MCP unavailable"})
 
 # Define base agent class
 class ServerManagementAgent:
+    # Cap on retained context entries; without one the per-request
+    # `context.update(data)` grows the dict forever in a long-lived worker.
+    CONTEXT_MAX_ENTRIES = 1024
+
     def __init__(self, agent: AgentExecutor, tools: List[BaseTool]):
         self.agent = agent
         self.tools = tools
-        self.context = {}
-        
+        self.context: "OrderedDict[str, Any]" = OrderedDict()
+
+    def _update_context(self, data: dict) -> None:
+        """Merge request data into the context, evicting least-recently-used
+        keys once the bound is exceeded."""
+        ctx = self.context
+        for key, value in data.items():
+            ctx[key] = value
+            ctx.move_to_end(key)
+        while len(ctx) > self.CONTEXT_MAX_ENTRIES:
+            ctx.popitem(last=False)
+
+    # Action name -> handler; a dict lookup keeps dispatch O(1) as tools grow
+    # instead of walking an if/elif chain per request.
+    _ACTIONS = {
+        'get_server_status': lambda self, data: self.get_server_status(),
+        'execute_command': lambda self, data: self.execute_command(data.get('command')),
+    }
+
     def process_request(self, request: str) -> str:
         """
         Process a user request using the agent
@@ -47,35 +85,33 @@ class ServerManagementAgent:
         try:
             # Parse request if it's JSON
             try:
-                parsed_request = json.loads(request)
+                parsed_request = json_loads(request)
                 action = parsed_request.get('action')
                 data = parsed_request.get('data', {})
-                
+
                 # Update context with new data
-                self.context.update(data)
-                
-                # Handle specific actions
-                if action == 'get_server_status':
-                    return self.get_server_status()
-                elif action == 'execute_command':
-                    return self.execute_command(data.get('command'))
-                
-            except json.JSONDecodeError:
+                self._update_context(data)
+
+                # Dispatch to the registered handler for this action
+                handler = self._ACTIONS.get(action)
+                if handler is not None:
+                    return handler(self, data)
+
+            except JSONDecodeError:
                 # Handle plain text requests
                 prompt = build_prompt(request, history=None)  # TODO: pass real history
                 return self.agent.run(prompt)
-                
+
         except Exception as e:
             return f"Error processing request: {str(e)}"
             
     def get_server_status(self) -> str:
         """Return status fetched via MCP connection."""
-        if not _MCP_CLIENT.connected:
-            _MCP_CLIENT.connect()
-        resp = _MCP_CLIENT.get_server_status("all")
-        if resp:
-            mem_store(json.dumps(resp), server_id="all", tags=["status"])
-        return json.dumps(resp or {"status": "error", "message": "MCP unavailable"})
+        resp = get_mcp_pool().get_server_status("all")
+        if not resp:
+            return _MCP_UNAVAILABLE
+        mem_submit(resp, server_id="all", tags=["status"])
+        return json_dumps_str(resp)
         
     def execute_command(self, command: Optional[str]) -> str:
         """
@@ -83,13 +119,12 @@ class ServerManagementAgent:
         """
         if not command:
             return "No command provided"
-            
-        if not _MCP_CLIENT.connected:
-            _MCP_CLIENT.connect()
-        resp = _MCP_CLIENT.execute_command("all", command)
-        if resp:
-            mem_store(json.dumps(resp), server_id="all", tags=["command"])
-        return json.dumps(resp or {"status": "error", "message": "MCP unavailable"})
+
+        resp = get_mcp_pool().execute_command("all", command)
+        if not resp:
+            return _MCP_UNAVAILABLE
+        mem_submit(resp, server_id="all", tags=["command"])
+        return json_dumps_str(resp)
         
 # Define custom tools for server management
 class ServerStatusTool(BaseTool):
@@ -1,11 +1,12 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
+import threading
 import time
 from dotenv import load_dotenv
 
-from mcp_client import MCPClient
-from llm_service import process_chat_message
+from mcp_client import MCPPool
+from llm_service import process_chat_message, stream_chat
 from memory_client import wipe_all as mem_wipe_all, wipe_before as mem_wipe_before
 from workflow_engine import get_workflow_engine
 from multi_model_service import get_multi_model_service
@@ -15,23 +16,62 @@ load_dotenv()
 app = Flask(__name__, static_folder='frontend/build', static_url_path='')
 CORS(app)
 
+# Back `jsonify` with orjson when available: it serialises straight to UTF-8
+# bytes, skipping Flask's default str -> utf-8 double encode on every response.
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class _OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj)
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+    app.json = _OrjsonProvider(app)
+except (ModuleNotFoundError, ImportError):  # pragma: no cover – optional dependency
+    pass
+
 @app.route('/')
 def index():
     return app.send_static_file('index.html')
 
+# Constant payloads are serialised once at import; load balancers hammer
+# /api/health, so the handler should not re-encode the same dict per probe.
+from fast_json import dumps as _json_dumps_bytes
+
+_HEALTH_OK = _json_dumps_bytes({"status": "healthy"})
+
+
 @app.route('/api/health')
 def health_check():
-    return jsonify({"status": "healthy"})
+    return Response(_HEALTH_OK, mimetype='application/json')
+
+# MCP connection pool is created lazily so importing the app (e.g. in tests
+# or under Gunicorn's master process) never blocks on a TCP connect; the pool
+# lets concurrent requests fan out over independent connections.
+_MCP_POOL_FLASK = None
+_MCP_POOL_LOCK = threading.Lock()
+
+
+def _get_mcp_pool() -> MCPPool:
+    global _MCP_POOL_FLASK
+    if _MCP_POOL_FLASK is None:
+        with _MCP_POOL_LOCK:
+            if _MCP_POOL_FLASK is None:
+                _MCP_POOL_FLASK = MCPPool()
+    return _MCP_POOL_FLASK
 
-_MCP_CLIENT_FLASK = MCPClient()
-_MCP_CLIENT_FLASK.connect()
 
 @app.route('/api/servers')
 def get_servers():
     """Return list/status of servers via MCP."""
-    if not _MCP_CLIENT_FLASK.connected:
-        _MCP_CLIENT_FLASK.connect()
-    status = _MCP_CLIENT_FLASK.get_server_status("all") or {"status": "error"}
+    status = _get_mcp_pool().get_server_status("all") or {"status": "error"}
     return jsonify(status)
 
 @app.route('/api/servers/<server_id>/memory', methods=['DELETE'])
@@ -105,5 +145,31 @@ def chat():
     response_text = process_chat_message(message, history=history)
     return jsonify({"response": response_text})
 
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Stream the chat response as server-sent events.
+
+    Emitting tokens as they arrive cuts time-to-first-byte from total
+    generation time to first-token time; /api/chat keeps the buffered JSON
+    contract for existing clients.
+    """
+    request_data = request.json or {}
+    message = request_data.get("message", "")
+    history = request_data.get("history", [])
+
+    def _events():
+        for chunk in stream_chat(message, history=history):
+            # SSE data must not contain raw newlines: emit one data: line
+            # per embedded line (clients rejoin them with \n), otherwise
+            # continuation lines are silently dropped by EventSource.
+            lines = chunk.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            yield "".join(f"data: {line}\n" for line in lines) + "\n"
+        yield "data: [DONE]\n\n"
+
+    return Response(stream_with_context(_events()), mimetype='text/event-stream')
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5010)
+    # Development only; in production run under Gunicorn (see gunicorn.conf.py)
+    # so slow LLM/MCP calls don't serialize every other request.
+    app.run(debug=True, port=5010, threaded=True)
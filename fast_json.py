@@ -0,0 +1,52 @@
+"""Shared fast-JSON helpers.
+
+The MCP and chat paths serialise/deserialise JSON on every request, so the
+JSON codec shows up prominently in profiles.  `orjson` (a Rust implementation
+with a direct UTF-8 byte path) parses roughly 4-5x faster than the stdlib
+module and serialises to `bytes` without an intermediate `str`.  As with the
+other optional dependencies in this project, we degrade gracefully to the
+stdlib implementation when `orjson` is not installed.
+
+Each helper is defined exactly once and dispatches on ``ORJSON_AVAILABLE``
+internally (rather than try/except-scoped duplicate definitions) so the
+module stays compilable by mypyc — see scripts/build_native.sh.
+"""
+from __future__ import annotations
+
+import json as _json
+from typing import Any, Union
+
+# Both orjson and the stdlib raise a ValueError subclass on malformed input,
+# so callers can catch this one name regardless of the active backend.
+JSONDecodeError = ValueError
+
+try:
+    import orjson as _orjson  # type: ignore
+
+    ORJSON_AVAILABLE = True
+except ModuleNotFoundError:  # pragma: no cover – optional dependency
+    _orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse JSON from a str or UTF-8 bytes."""
+    if ORJSON_AVAILABLE:
+        return _orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return _json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialise ``obj`` to UTF-8 bytes (orjson's native output)."""
+    if ORJSON_AVAILABLE:
+        return _orjson.dumps(obj)
+    return _json.dumps(obj).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialise ``obj`` to a str for callers that need text."""
+    if ORJSON_AVAILABLE:
+        return _orjson.dumps(obj).decode()
+    return _json.dumps(obj)
@@ -0,0 +1,19 @@
+"""Gunicorn configuration for the Flask API.
+
+The Werkzeug dev server (`python app.py`) is single-threaded, so one slow
+LLM or MCP round-trip blocks every other request.  In production run:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+Threaded (gthread) workers are a good fit here: the hot endpoints spend
+their time waiting on sockets (MCP, LLM providers, memory service), which
+releases the GIL, so threads overlap cleanly.
+"""
+import multiprocessing
+
+bind = "0.0.0.0:5010"
+workers = multiprocessing.cpu_count() * 2 + 1
+threads = 8
+worker_class = "gthread"
+keepalive = 5
+timeout = 120  # LLM calls can legitimately take a while
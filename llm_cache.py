@@ -0,0 +1,158 @@
+"""Two-tier response cache for LLM calls.
+
+LLM round-trips are the dominant latency (seconds) and dollar cost in the
+whole system, so repeated or near-duplicate queries should never reach the
+model twice.  This module provides:
+
+* :class:`ExactCache` – a bounded TTL+LRU map keyed by a SHA-256 digest of the
+  normalised prompt (plus model id), for verbatim repeats.
+* :class:`SemanticCache` – a small in-process vector index over hashed
+  bag-of-words embeddings with a cosine-similarity threshold, for paraphrased
+  repeats.  The embedding function is pluggable so a real sentence-encoder can
+  be dropped in where one is available; the default is dependency-free.
+
+Both tiers deliberately stay conservative: callers should bypass them for
+stateful requests (non-empty conversation history, action-style JSON).
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+_EMBED_DIM = 256
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace and case so trivial variations share a cache key."""
+    return " ".join(prompt.lower().split())
+
+
+def make_key(prompt: str, *, model_id: Optional[str] = None, system_prompt: str = "") -> str:
+    """Return a stable cache key for a (model, prompt, system prompt) triple."""
+    material = f"{model_id or ''}\x00{normalize_prompt(prompt)}\x00{system_prompt}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def default_embed(text: str) -> List[float]:
+    """Cheap hashed bag-of-words embedding (no external model required)."""
+    vec = [0.0] * _EMBED_DIM
+    for token in normalize_prompt(text).split():
+        digest = hashlib.md5(token.encode("utf-8")).digest()
+        idx = int.from_bytes(digest[:4], "little") % _EMBED_DIM
+        sign = 1.0 if digest[4] & 1 else -1.0
+        vec[idx] += sign
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm:
+        vec = [v / norm for v in vec]
+    return vec
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class ExactCache:
+    """Bounded TTL+LRU cache for exact prompt repeats."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+class SemanticCache:
+    """Approximate cache keyed by prompt embedding + cosine threshold.
+
+    Entries expire after ``ttl`` seconds (like the exact tier) and carry the
+    model id they were generated with, so a paraphrase match never serves
+    one model's answer for another or outlives its freshness window.
+    """
+
+    def __init__(self, maxsize: int = 512, threshold: float = 0.95,
+                 ttl: float = 300.0,
+                 embed: Callable[[str], List[float]] = default_embed):
+        self._maxsize = maxsize
+        self._threshold = threshold
+        self._ttl = ttl
+        self._embed = embed
+        self._entries: List[Tuple[float, List[float], Optional[str], str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, prompt: str, *, model_id: Optional[str] = None) -> Optional[str]:
+        query = self._embed(prompt)
+        now = time.monotonic()
+        with self._lock:
+            # Prune expired entries in passing; the scan is linear anyway.
+            self._entries = [e for e in self._entries if now - e[0] <= self._ttl]
+            best_score, best_value = 0.0, None
+            for _stored_at, vec, entry_model, value in self._entries:
+                if entry_model != model_id:
+                    continue
+                score = _cosine(query, vec)
+                if score > best_score:
+                    best_score, best_value = score, value
+            if best_score >= self._threshold:
+                return best_value
+        return None
+
+    def add(self, prompt: str, value: str, *, model_id: Optional[str] = None) -> None:
+        vec = self._embed(prompt)
+        with self._lock:
+            self._entries.append((time.monotonic(), vec, model_id, value))
+            if len(self._entries) > self._maxsize:
+                del self._entries[0]
+
+
+# Shared instances used by the chat path.
+exact_cache = ExactCache()
+semantic_cache = SemanticCache()
+
+# Adapter failures come back as plain strings; recognise their shapes so a
+# transient provider outage is never cached and replayed as an answer.
+_ERROR_PREFIXES = ("error", "no available models", "no response", "[stubllm]")
+
+
+def is_error_response(response: str) -> bool:
+    """True for adapter failure strings that must never be cached."""
+    head = response.lstrip().lower()
+    return head.startswith(_ERROR_PREFIXES) or head.endswith("not initialized")
+
+
+def lookup(prompt: str, *, model_id: Optional[str] = None) -> Optional[str]:
+    """Check both tiers; exact match wins, semantic is the fallback."""
+    hit = exact_cache.get(make_key(prompt, model_id=model_id))
+    if hit is not None:
+        return hit
+    return semantic_cache.get(prompt, model_id=model_id)
+
+
+def store(prompt: str, response: str, *, model_id: Optional[str] = None) -> None:
+    """Record a fresh generation in both tiers; error responses are skipped."""
+    if is_error_response(response):
+        return
+    exact_cache.set(make_key(prompt, model_id=model_id), response)
+    semantic_cache.add(prompt, response, model_id=model_id)
@@ -8,9 +8,13 @@ lightweight fallbacks when those imports fail.
 from __future__ import annotations
 
 import os
-import json
+import re
+import threading
 from typing import Any, Sequence
 
+from fast_json import dumps_str as json_dumps_str
+import llm_cache
+
 try:
     from openai import OpenAI  # type: ignore
     from langchain.agents import initialize_agent, Tool  # type: ignore
@@ -61,10 +65,14 @@ except Exception:  # pragma: no cover
 
 # Define tools for the agent
 # These will be expanded as we add more functionality
-from mcp_client import MCPClient
+from mcp_client import MCPPool
+
+_MCP_POOL_TOOL = MCPPool()
+# Clients in the pool connect lazily on first checkout, so constructing the
+# pool at import stays cheap.
 
-_MCP_CLIENT_TOOL = MCPClient()
-# Do not connect immediately; defer until first use to avoid errors during import.
+# Serialised once; returned on every failed MCP round-trip.
+_MCP_UNAVAILABLE = json_dumps_str({"status": "error", "message": "MCP unavailable"})
 
 class ServerManagementTool(BaseTool):  # type: ignore
     name = "server_management"
@@ -72,49 +80,156 @@ class ServerManagementTool(BaseTool):  # type: ignore
 
     def _run(self, query: str):
         """Very naive implementation: if query contains 'status' -> GET_SERVER_STATUS."""
-        if not _MCP_CLIENT_TOOL.connected:
-            _MCP_CLIENT_TOOL.connect()
         if "status" in query.lower():
-            resp = _MCP_CLIENT_TOOL.get_server_status("all")
+            resp = _MCP_POOL_TOOL.get_server_status("all")
         else:
-            resp = _MCP_CLIENT_TOOL.execute_command("all", query)
-        return json.dumps(resp or {"status": "error", "message": "MCP unavailable"})
+            resp = _MCP_POOL_TOOL.execute_command("all", query)
+        if not resp:
+            return _MCP_UNAVAILABLE
+        return json_dumps_str(resp)
 
     async def _arun(self, query: str):
         return self._run(query)
 
-# Initialize the language model
-try:
-    llm = ChatOpenAI(temperature=0.7)  # type: ignore
-except Exception:
-    llm = None  # type: ignore
-
 tools = [
     ServerManagementTool(),
     # More tools will be added as we implement more functionality
 ]
 
-# Initialize the agent
-agent = initialize_agent(
-    tools,
-    llm,
-    agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
-    verbose=True
+# LangChain agent (and its ChatOpenAI model) are built lazily: constructing
+# the agent graph at import time adds hundreds of ms to every `import app`.
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def get_agent():
+    """Get or create the LangChain agent on first use."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                try:
+                    llm = ChatOpenAI(temperature=0.7)  # type: ignore
+                except Exception:
+                    llm = None  # type: ignore
+                _agent = initialize_agent(
+                    tools,
+                    llm,
+                    agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
+                    verbose=True
+                )
+    return _agent
+
+# Lightweight router: plain status queries and explicit command requests do
+# not need a multi-second agent loop -- they map 1:1 onto an MCP call.  Only
+# genuinely conversational messages fall through to the LLM.
+#
+# The status pattern is anchored over the whole message so only messages
+# that *are* a status question route ("server status?", "is everything
+# up?"); a sentence that merely contains "up" or "running" ("my app keeps
+# running out of memory") falls through to the model.
+_STATUS_RE = re.compile(
+    r"^(?:(?:what(?:'s| is)|show(?: me)?|get|check|give me)\s+)?"
+    r"(?:the\s+)?(?:(?:servers?|system)\s+)?(?:status|health|uptime)\s*\??$"
+    r"|^(?:is|are)\s+(?:the\s+)?(?:servers?|system|everything|it)\s+"
+    r"(?:up|online|running|healthy|ok|alive)\s*\??$",
+    re.IGNORECASE,
 )
+# Commands only route on the explicit "run: <cmd>" form — a bare space after
+# the verb would turn chat like "run diagnostics on my app please" into a
+# shell command executed on every server.
+_COMMAND_RE = re.compile(r"^\s*(?:run|execute|exec)\s*:\s*(?P<cmd>.+)$", re.IGNORECASE)
+
+
+def _classify(message: str, history: Sequence[str] | None = None) -> str:
+    """Classify a message as 'status', 'command' or 'chat'.
+
+    Mid-conversation messages are never routed: with history present the
+    message is a follow-up in an LLM exchange, and short-circuiting it to a
+    raw MCP call would drop the conversational context.
+    """
+    if history:
+        return "chat"
+    if _COMMAND_RE.match(message):
+        return "command"
+    if _STATUS_RE.match(message.strip()):
+        return "status"
+    return "chat"
+
 
 def process_chat_message(message: str, history: Sequence[str] | None = None, model_id: str | None = None, server_id: str | None = None):
     """Process a chat message using the LLM agent"""
     try:
+        # Smart routing: trivial queries go straight to MCP, no LLM round-trip
+        route = _classify(message, history)
+        if route == "status":
+            resp = _MCP_POOL_TOOL.get_server_status(server_id or "all")
+            return json_dumps_str(resp) if resp else _MCP_UNAVAILABLE
+        if route == "command":
+            cmd = _COMMAND_RE.match(message).group("cmd").strip()
+            resp = _MCP_POOL_TOOL.execute_command(server_id or "all", cmd)
+            return json_dumps_str(resp) if resp else _MCP_UNAVAILABLE
+
+        # Cache only stateless requests: a non-empty history makes the answer
+        # conversation-dependent, so those always go to the model.
+        cacheable = not history
+        if cacheable:
+            cached = llm_cache.lookup(message, model_id=model_id)
+            if cached is not None:
+                return cached
+
         # Try multi-model service first, fallback to LangChain agent
         multi_model = get_multi_model_service()
         if multi_model and multi_model.default_model:
             prompt = build_prompt(message, history=history, server_id=server_id)
             response = multi_model.generate_response(prompt, model_id=model_id)
-            return response
         else:
             # Fallback to original LangChain agent
             prompt = build_prompt(message, history=history, server_id=server_id)
-            response = agent.run(prompt)
-            return response
+            response = get_agent().run(prompt)
+
+        if cacheable:
+            llm_cache.store(message, response, model_id=model_id)
+        return response
     except Exception as e:
         return f"Error processing message: {str(e)}"
+
+
+def stream_chat(message: str, history: Sequence[str] | None = None, model_id: str | None = None, server_id: str | None = None):
+    """Yield the chat response incrementally.
+
+    Streaming collapses time-to-first-byte from total generation time to
+    first-token time.  Routed (status/command) and cached responses are
+    emitted as a single chunk; fresh generations stream from the provider and
+    are recorded in the cache once complete.
+    """
+    try:
+        route = _classify(message, history)
+        if route in ("status", "command"):
+            yield process_chat_message(message, history=history, model_id=model_id, server_id=server_id)
+            return
+
+        cacheable = not history
+        if cacheable:
+            cached = llm_cache.lookup(message, model_id=model_id)
+            if cached is not None:
+                yield cached
+                return
+
+        multi_model = get_multi_model_service()
+        prompt = build_prompt(message, history=history, server_id=server_id)
+        if multi_model and multi_model.default_model:
+            chunks = []
+            for chunk in multi_model.generate_response_stream(prompt, model_id=model_id):
+                chunks.append(chunk)
+                yield chunk
+            if cacheable and chunks:
+                llm_cache.store(message, "".join(chunks), model_id=model_id)
+        else:
+            # LangChain agent has no streaming interface; emit in one chunk
+            response = get_agent().run(prompt)
+            if cacheable:
+                llm_cache.store(message, response, model_id=model_id)
+            yield response
+    except Exception as e:
+        yield f"Error processing message: {str(e)}"
@@ -1,9 +1,14 @@
 """Minimal stub MCP server for local development and testing.
 
-It speaks a naive JSON-over-TCP protocol compatible with `mcp_client.MCPClient`.
-The implementation is intentionally lightweight; it **does not** perform any
-real server-management tasks.  Instead it returns canned responses that enable
-end-to-end wiring tests without requiring an actual infrastructure backend.
+It speaks a naive length-prefixed JSON-over-TCP protocol compatible with
+`mcp_client.MCPClient`.  The implementation is intentionally lightweight; it
+**does not** perform any real server-management tasks.  Instead it returns
+canned responses that enable end-to-end wiring tests without requiring an
+actual infrastructure backend.
+
+Connections are multiplexed on a single asyncio event loop rather than a
+thread per socket, so the stub sustains thousands of concurrent clients
+without paying OS-thread creation, stack memory, or context-switch costs.
 
 Usage (development):
 --------------------
@@ -14,89 +19,144 @@ The module can also be imported and `run_server()` invoked programmatically
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import os
 import socket
+import struct
 import threading
 from types import TracebackType
-from typing import Dict, Optional, Type
+from typing import Dict, List, Optional, Type
+
+from fast_json import loads as json_loads, dumps as json_dumps
 
 _HOST = "0.0.0.0"
 _PORT = 5000  # Keep consistent with project port contract
-_BUFFER_SIZE = 4096
+
+# Frame header: 4-byte big-endian payload length.  A precompiled Struct skips
+# re-parsing the format string on every pack/unpack.
+_HDR = struct.Struct(">I")
+
+# Connections cost an asyncio task plus stream buffers each; cap them so a
+# connection flood degrades to refusals instead of unbounded task growth.
+_MAX_CONNECTIONS = int(os.getenv("MCP_STUB_MAX_CONNECTIONS", "1024"))
 
 logging.basicConfig(level=logging.INFO, format="[MCPStub] %(message)s")
 
 
-class _ClientHandler(threading.Thread):
-    """Handle a single client socket connection."""
+# Pre-encoded reply templates for the two hot request types.  Building the
+# response dict and serializing it dominates per-request cost in this stub,
+# so the fast path reduces to a couple of bytes.replace calls on a constant.
+_STATUS_TMPL = (
+    b'{"response_to":"GET_SERVER_STATUS","status":"ok","id":"__MID__",'
+    b'"server_id":"__SID__","server_status":{"cpu":"10%","memory":"512Mi","uptime":"2d 4h"}}'
+)
+_COMMAND_TMPL = (
+    b'{"response_to":"EXECUTE_COMMAND","status":"ok","id":"__MID__",'
+    b'"server_id":"__SID__","output":"Executed \'__CMD__\' successfully"}'
+)
 
-    def __init__(self, conn: socket.socket, addr):  # noqa: ANN001
-        super().__init__(daemon=True)
-        self._conn = conn
-        self._addr = addr
 
-    def run(self) -> None:  # noqa: D401
-        logging.info("Connection from %s", self._addr)
-        try:
-            while True:
-                data = self._conn.recv(_BUFFER_SIZE)
-                if not data:
-                    break
-                try:
-                    request = json.loads(data.decode("utf-8"))
-                    response = self._handle_request(request)
-                except Exception as exc:  # pragma: no cover – any decoding error
-                    response = {
-                        "response_to": "ERROR",
-                        "status": "error",
-                        "message": str(exc),
-                    }
-                self._conn.sendall(json.dumps(response).encode("utf-8"))
-        finally:
-            self._conn.close()
-            logging.info("Connection closed: %s", self._addr)
+def _tmpl_safe(value: object) -> bool:
+    """True when the value can be spliced into a JSON template verbatim.
+
+    Quotes, backslashes and control characters (ordinals < 0x20) all require
+    JSON escaping, so values containing them fall back to the dict+serialize
+    path instead of producing an invalid frame.
+    """
+    return (
+        isinstance(value, str)
+        and '"' not in value
+        and "\\" not in value
+        and not any(c < " " for c in value)
+    )
 
-    @staticmethod
-    def _handle_request(request: Dict[str, object]) -> Dict[str, object]:
-        """Return canned response matching the request type."""
-        rtype = request.get("type")
+
+def _handle_request(request: Dict[str, object]) -> "bytes | Dict[str, object]":
+    """Return the canned response matching the request type.
+
+    The hot request types return pre-encoded ``bytes`` (template with the
+    per-request fields substituted in); everything else falls back to the
+    dict + serialize path.
+    """
+    rtype = request.get("type")
+    msg_id = request.get("id")
+    if _tmpl_safe(msg_id):
         if rtype == "GET_SERVER_STATUS":
             server_id = request.get("server_id", "unknown")
-            return {
-                "response_to": rtype,
-                "status": "ok",
-                "server_id": server_id,
-                "server_status": {
-                    "cpu": "10%",
-                    "memory": "512Mi",
-                    "uptime": "2d 4h",
-                },
-            }
-        if rtype == "EXECUTE_COMMAND":
-            cmd = request.get("command", "")
+            if _tmpl_safe(server_id):
+                return (_STATUS_TMPL
+                        .replace(b"__MID__", msg_id.encode())
+                        .replace(b"__SID__", server_id.encode()))
+        elif rtype == "EXECUTE_COMMAND":
             server_id = request.get("server_id", "unknown")
-            return {
-                "response_to": rtype,
-                "status": "ok",
-                "server_id": server_id,
-                "output": f"Executed '{cmd}' successfully",
-            }
+            cmd = request.get("command", "")
+            if _tmpl_safe(server_id) and _tmpl_safe(cmd):
+                return (_COMMAND_TMPL
+                        .replace(b"__MID__", msg_id.encode())
+                        .replace(b"__SID__", server_id.encode())
+                        .replace(b"__CMD__", cmd.encode()))
+
+    response = _build_response(rtype, request)
+    # Echo the client's message id so replies can be correlated
+    if "id" in request:
+        response["id"] = request["id"]
+    return response
+
+
+def _build_response(rtype, request: Dict[str, object]) -> Dict[str, object]:
+    if rtype == "GET_SERVER_STATUS":
+        server_id = request.get("server_id", "unknown")
+        return {
+            "response_to": rtype,
+            "status": "ok",
+            "server_id": server_id,
+            "server_status": {
+                "cpu": "10%",
+                "memory": "512Mi",
+                "uptime": "2d 4h",
+            },
+        }
+    if rtype == "EXECUTE_COMMAND":
+        cmd = request.get("command", "")
+        server_id = request.get("server_id", "unknown")
         return {
-            "response_to": rtype or "UNKNOWN",
-            "status": "error",
-            "message": "Unsupported request type",
+            "response_to": rtype,
+            "status": "ok",
+            "server_id": server_id,
+            "output": f"Executed '{cmd}' successfully",
         }
+    return {
+        "response_to": rtype or "UNKNOWN",
+        "status": "error",
+        "message": "Unsupported request type",
+    }
 
 
 class MCPStubServer:
-    """Context-manager wrapper for the stub server (useful in tests)."""
+    """Context-manager wrapper for the stub server (useful in tests).
+
+    When the platform supports ``SO_REUSEPORT`` the server binds N listening
+    sockets to the same port, each served by its own event loop thread; the
+    kernel then load-balances incoming connections across the acceptors, so
+    accept throughput scales with core count and high connection churn no
+    longer serializes through a single ``accept()``.
+    """
 
-    def __init__(self, host: str = _HOST, port: int = _PORT):
+    def __init__(self, host: str = _HOST, port: int = _PORT, acceptors: Optional[int] = None):
         self._host = host
         self._port = port
-        self._sock: Optional[socket.socket] = None
-        self._thread: Optional[threading.Thread] = None
+        if acceptors is None:
+            acceptors = min(4, os.cpu_count() or 1)
+        if not hasattr(socket, "SO_REUSEPORT"):
+            acceptors = 1  # kernel can't balance multiple listeners
+        self._acceptors = acceptors
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._servers: List[asyncio.AbstractServer] = []
+        self._threads: List[threading.Thread] = []
+        # Shared across acceptor loops, hence guarded by a threading lock
+        self._conn_count = 0
+        self._conn_lock = threading.Lock()
 
     def __enter__(self):  # noqa: D401
         self.start()
@@ -106,39 +166,128 @@ class MCPStubServer:
         self.stop()
         return False
 
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle one client connection: framed request in, framed reply out."""
+        addr = writer.get_extra_info("peername")
+        with self._conn_lock:
+            if self._conn_count >= _MAX_CONNECTIONS:
+                logging.warning("Connection limit reached; refusing %s", addr)
+                writer.close()
+                return
+            self._conn_count += 1
+        conn = writer.get_extra_info("socket")
+        if conn is not None:
+            # Small request/response frames: disable Nagle so replies are not
+            # held back to coalesce, and keep idle connections alive.  Raising
+            # SO_RCVLOWAT to header-size+1 lets the kernel skip waking us for
+            # fragments too short to contain any payload.
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            try:
+                conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVLOWAT, _HDR.size + 1)
+            except (AttributeError, OSError):  # pragma: no cover – platform-dependent
+                pass
+        logging.info("Connection from %s", addr)
+        try:
+            while True:
+                header = await reader.readexactly(_HDR.size)
+                (frame_len,) = _HDR.unpack(header)
+                frame = await reader.readexactly(frame_len)
+                try:
+                    request = json_loads(frame)
+                    response = _handle_request(request)
+                except Exception as exc:  # pragma: no cover – any decoding error
+                    response = {
+                        "response_to": "ERROR",
+                        "status": "error",
+                        "message": str(exc),
+                    }
+                payload = response if isinstance(response, bytes) else json_dumps(response)
+                writer.write(_HDR.pack(len(payload)) + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass  # client went away – normal teardown
+        except asyncio.CancelledError:
+            pass  # server shutting down – close out quietly
+        finally:
+            with self._conn_lock:
+                self._conn_count -= 1
+            writer.close()
+            logging.info("Connection closed: %s", addr)
+
+    def _make_listener(self) -> socket.socket:
+        """Bind one listening socket; SO_REUSEPORT lets siblings share the port.
+
+        The socket is handed to the event loop already non-blocking, so
+        accepts are epoll-driven with no blocking accept() thread and no
+        extra fcntl on the listener.  A deep backlog lets the kernel absorb
+        connection bursts that arrive faster than the loop drains them.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self._acceptors > 1:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self._host, self._port))
+        sock.listen(1024)
+        sock.setblocking(False)
+        return sock
+
     def start(self) -> None:
-        """Start the server in a background thread."""
-        if self._thread and self._thread.is_alive():
+        """Start one event-loop thread per acceptor socket."""
+        if any(t.is_alive() for t in self._threads):
             return  # Already running
 
-        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        # Allow quick restart during dev
-        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self._sock.bind((self._host, self._port))
-        self._sock.listen()
-        logging.info("MCP stub listening on %s:%d", self._host, self._port)
+        self._loops, self._servers, self._threads = [], [], []
+        for _ in range(self._acceptors):
+            listener = self._make_listener()
+            started = threading.Event()
 
-        def _accept_loop(sock: socket.socket):  # noqa: D401
-            try:
-                while True:
-                    conn, addr = sock.accept()
-                    _ClientHandler(conn, addr).start()
-            finally:
-                sock.close()
+            def _run(sock: socket.socket = listener, ready: threading.Event = started) -> None:
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                server = loop.run_until_complete(asyncio.start_server(self._serve, sock=sock))
+                self._loops.append(loop)
+                self._servers.append(server)
+                ready.set()
+                loop.run_forever()
 
-        self._thread = threading.Thread(target=_accept_loop, args=(self._sock,), daemon=True)
-        self._thread.start()
+            thread = threading.Thread(target=_run, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            if not started.wait(timeout=5):
+                raise RuntimeError("MCP stub server failed to start")
+        logging.info("MCP stub listening on %s:%d (%d acceptors)", self._host, self._port, self._acceptors)
 
     def stop(self) -> None:
-        """Stop the server gracefully."""
-        if self._sock:
-            try:
-                self._sock.shutdown(socket.SHUT_RDWR)
-            except OSError:
-                pass
-            self._sock.close()
-        if self._thread:
-            self._thread.join(timeout=1)
+        """Stop the server gracefully.
+
+        In-flight connection handlers are cancelled and awaited *before* the
+        loop stops, and each loop is closed once its thread has exited, so
+        teardown (e.g. at the end of an integration test) does not spray
+        \"Task was destroyed but it is pending\" warnings or closed-loop
+        tracebacks from handlers still holding open writers.
+        """
+        for loop, server in zip(self._loops, self._servers):
+            if loop.is_running():
+                def _shutdown(loop: asyncio.AbstractEventLoop = loop, server: asyncio.AbstractServer = server) -> None:
+                    async def _drain() -> None:
+                        server.close()
+                        await server.wait_closed()
+                        tasks = [t for t in asyncio.all_tasks(loop)
+                                 if t is not asyncio.current_task()]
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                        loop.stop()
+
+                    asyncio.ensure_future(_drain())
+
+                loop.call_soon_threadsafe(_shutdown)
+        for thread in self._threads:
+            thread.join(timeout=1)
+        for loop in self._loops:
+            if not loop.is_running():
+                loop.close()
         logging.info("MCP stub stopped")
 
 
@@ -8,28 +8,50 @@ continues to function during local development.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import threading
 import time
 from typing import List, Dict, Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# httpx powers the async variants; when it is missing we fall back to running
+# the sync calls on a worker thread so async callers still work.
+try:
+    import httpx  # type: ignore
+    _HTTPX_AVAILABLE = True
+except ModuleNotFoundError:  # pragma: no cover – optional dependency
+    _HTTPX_AVAILABLE = False
 
 # Environment variables
 _MEMORY_BASE_URL = os.getenv("MEMORY_SERVICE_URL", "http://localhost:8001")
 _MEMORY_API_KEY = os.getenv("MEMORY_SERVICE_API_KEY")
 
+# Keep-alive pool sized for concurrent workers: the default adapter caps the
+# pool at 10 connections, which forces handshakes (1 RTT each) under fan-out.
 _SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=128,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
 _DEFAULT_TIMEOUT = float(os.getenv("MEMORY_CLIENT_TIMEOUT", 3))
 
-logging.basicConfig(level=logging.INFO, format="[MemoryClient] %(message)s")
-
+# Headers never change after import (_MEMORY_API_KEY is read once), so build
+# them once and install them as session defaults instead of allocating a
+# fresh dict on every store/search/wipe call.
+_HEADERS: Dict[str, str] = {"Content-Type": "application/json"}
+if _MEMORY_API_KEY:
+    _HEADERS["x-api-key"] = _MEMORY_API_KEY
+_SESSION.headers.update(_HEADERS)
 
-def _headers() -> Dict[str, str]:
-    headers: Dict[str, str] = {"Content-Type": "application/json"}
-    if _MEMORY_API_KEY:
-        headers["x-api-key"] = _MEMORY_API_KEY
-    return headers
+logging.basicConfig(level=logging.INFO, format="[MemoryClient] %(message)s")
 
 
 def health() -> bool:
@@ -41,7 +63,8 @@ def health() -> bool:
         return False
 
 
-def store(content: str, *, server_id: Optional[str] = None, tags: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> bool:
+def _build_item(content: str, *, server_id: Optional[str] = None, tags: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build one memory payload; shared by single and bulk stores."""
     payload: Dict[str, Any] = {
         "content": content,
         "timestamp": int(time.time()),
@@ -53,21 +76,85 @@ def store(content: str, *, server_id: Optional[str] = None, tags: Optional[List[
         payload["tags"] = tags
     if metadata:
         payload["metadata"] = metadata
+    return payload
+
+
+def store(content: str, *, server_id: Optional[str] = None, tags: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> bool:
+    payload = _build_item(content, server_id=server_id, tags=tags, metadata=metadata)
     try:
-        resp = _SESSION.post(f"{_MEMORY_BASE_URL}/memory", json=payload, headers=_headers(), timeout=_DEFAULT_TIMEOUT)
+        resp = _SESSION.post(f"{_MEMORY_BASE_URL}/memory", json=payload, timeout=_DEFAULT_TIMEOUT)
         return resp.status_code == 200
     except requests.RequestException as exc:
         logging.warning("Memory store failed: %s", exc)
         return False
 
 
+def store_bulk(items: List[Dict[str, Any]]) -> bool:
+    """Store many memory items in one ``POST /memory/bulk`` round-trip.
+
+    Items are payload dicts as produced by :func:`_build_item`; callers in
+    tight loops (conversation ingestion, workflow telemetry) should prefer
+    this over N individual :func:`store` calls, which cost N RTTs.
+    """
+    if not items:
+        return True
+    try:
+        resp = _SESSION.post(f"{_MEMORY_BASE_URL}/memory/bulk", json={"items": items}, timeout=_DEFAULT_TIMEOUT)
+        return resp.status_code == 200
+    except requests.RequestException as exc:
+        logging.warning("Memory bulk store failed: %s", exc)
+        return False
+
+
+# Client-side coalescing: store_batched() buffers items and a timer (or the
+# batch filling up) flushes them as a single bulk call, replacing N RTTs
+# with one whenever the memory service is remote.
+_BATCH_INTERVAL = float(os.getenv("MEMORY_BATCH_INTERVAL", "0.1"))
+_BATCH_MAX = 64
+_BATCH: List[Dict[str, Any]] = []
+_BATCH_LOCK = threading.Lock()
+_BATCH_TIMER: Optional[threading.Timer] = None
+
+
+def store_batched(content: str, *, server_id: Optional[str] = None, tags: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Queue a store to be flushed with the next bulk batch.
+
+    Fire-and-forget: the write happens within MEMORY_BATCH_INTERVAL seconds
+    (default 100ms) or as soon as the batch fills, whichever comes first.
+    Call :func:`flush` on shutdown to push out any tail.
+    """
+    global _BATCH_TIMER
+    item = _build_item(content, server_id=server_id, tags=tags, metadata=metadata)
+    with _BATCH_LOCK:
+        _BATCH.append(item)
+        full = len(_BATCH) >= _BATCH_MAX
+        if not full and _BATCH_TIMER is None:
+            _BATCH_TIMER = threading.Timer(_BATCH_INTERVAL, flush)
+            _BATCH_TIMER.daemon = True
+            _BATCH_TIMER.start()
+    if full:
+        flush()
+
+
+def flush() -> bool:
+    """Flush any pending batched stores; returns the bulk call's success."""
+    global _BATCH_TIMER
+    with _BATCH_LOCK:
+        if _BATCH_TIMER is not None:
+            _BATCH_TIMER.cancel()
+            _BATCH_TIMER = None
+        batch = _BATCH[:]
+        _BATCH.clear()
+    return store_bulk(batch)
+
+
 def search(query: str, *, limit: int = 3, server_id: Optional[str] = None) -> List[str]:
     """Return a list of memory content strings most relevant to the query."""
     params = {"q": query, "limit": limit}
     if server_id:
         params["filter_tag"] = f"server:{server_id}"
     try:
-        resp = _SESSION.get(f"{_MEMORY_BASE_URL}/memory/search", params=params, headers=_headers(), timeout=_DEFAULT_TIMEOUT)
+        resp = _SESSION.get(f"{_MEMORY_BASE_URL}/memory/search", params=params, timeout=_DEFAULT_TIMEOUT)
         if resp.status_code == 200:
             data = resp.json()
             return [item["content"] for item in data.get("results", [])]
@@ -76,10 +163,44 @@ def search(query: str, *, limit: int = 3, server_id: Optional[str] = None) -> Li
     return []
 
 
+_ASYNC_CLIENT: Optional["httpx.AsyncClient"] = None
+
+
+def _get_async_client() -> "httpx.AsyncClient":
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            timeout=_DEFAULT_TIMEOUT,
+            headers=_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=64),
+        )
+    return _ASYNC_CLIENT
+
+
+async def search_async(query: str, *, limit: int = 3, server_id: Optional[str] = None) -> List[str]:
+    """Async variant of :func:`search` for callers that want to overlap the
+    memory lookup with other I/O (e.g. prompt construction)."""
+    if not _HTTPX_AVAILABLE:
+        return await asyncio.to_thread(search, query, limit=limit, server_id=server_id)
+    params: Dict[str, Any] = {"q": query, "limit": limit}
+    if server_id:
+        params["filter_tag"] = f"server:{server_id}"
+    try:
+        resp = await _get_async_client().get(
+            f"{_MEMORY_BASE_URL}/memory/search", params=params
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            return [item["content"] for item in data.get("results", [])]
+    except httpx.HTTPError as exc:
+        logging.info("Memory search unavailable: %s", exc)
+    return []
+
+
 def wipe_all(server_id: str) -> bool:
     """Delete all memories for a server."""
     try:
-        resp = _SESSION.delete(f"{_MEMORY_BASE_URL}/memory", params={"filter_tag": f"server:{server_id}"}, headers=_headers(), timeout=_DEFAULT_TIMEOUT)
+        resp = _SESSION.delete(f"{_MEMORY_BASE_URL}/memory", params={"filter_tag": f"server:{server_id}"}, timeout=_DEFAULT_TIMEOUT)
         return resp.status_code == 200
     except requests.RequestException as exc:
         logging.warning("Memory wipe failed: %s", exc)
@@ -90,7 +211,7 @@ def wipe_before(server_id: str, before_ts: int) -> bool:
     """Delete memories before timestamp for a server."""
     try:
         params = {"filter_tag": f"server:{server_id}", "before": before_ts}
-        resp = _SESSION.delete(f"{_MEMORY_BASE_URL}/memory", params=params, headers=_headers(), timeout=_DEFAULT_TIMEOUT)
+        resp = _SESSION.delete(f"{_MEMORY_BASE_URL}/memory", params=params, timeout=_DEFAULT_TIMEOUT)
         return resp.status_code == 200
     except requests.RequestException as exc:
         logging.warning("Memory wipe failed: %s", exc)
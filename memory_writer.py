@@ -0,0 +1,85 @@
+"""Background writer that takes memory stores off the request path.
+
+`agent_service` used to call `memory_client.store` synchronously after every
+MCP response, adding a full memory-service round-trip to `/api/servers` and
+`/api/chat` latency.  Writers enqueue instead; a single daemon thread drains
+the queue in batches, serialises payloads (so even the orjson dump happens
+off the request thread) and performs the HTTP calls.
+
+Back-pressure policy: the queue is bounded and overflow drops the *oldest*
+entry — memory writes are best-effort telemetry, so losing a stale record is
+preferable to blocking a live request.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, List, Optional
+
+from fast_json import dumps_str as json_dumps_str
+from memory_client import _build_item as mem_build_item
+from memory_client import store_bulk as mem_store_bulk
+
+logging.basicConfig(level=logging.INFO, format="[MemoryWriter] %(message)s")
+
+_QUEUE_MAX = 10_000
+_BATCH_MAX = 64
+
+_queue: "queue.Queue" = queue.Queue(maxsize=_QUEUE_MAX)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def _drain_loop() -> None:
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < _BATCH_MAX:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        # One /memory/bulk round-trip per drained batch instead of one HTTP
+        # call per item.
+        items = []
+        for content, server_id, tags in batch:
+            try:
+                if not isinstance(content, str):
+                    content = json_dumps_str(content)
+                items.append(mem_build_item(content, server_id=server_id, tags=tags))
+            except Exception as exc:  # pragma: no cover – never kill the worker
+                logging.warning("Memory write failed: %s", exc)
+        try:
+            mem_store_bulk(items)
+        except Exception as exc:  # pragma: no cover – never kill the worker
+            logging.warning("Memory bulk write failed: %s", exc)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        with _worker_lock:
+            if _worker is None or not _worker.is_alive():
+                _worker = threading.Thread(target=_drain_loop, daemon=True)
+                _worker.start()
+
+
+def submit(content: Any, *, server_id: Optional[str] = None, tags: Optional[List[str]] = None) -> None:
+    """Queue a memory store; returns immediately.
+
+    ``content`` may be a str or any JSON-serialisable object — serialisation
+    happens on the writer thread.
+    """
+    _ensure_worker()
+    item = (content, server_id, tags)
+    try:
+        _queue.put_nowait(item)
+    except queue.Full:
+        try:
+            _queue.get_nowait()  # drop the oldest entry
+        except queue.Empty:
+            pass
+        try:
+            _queue.put_nowait(item)
+        except queue.Full:  # pragma: no cover – racing producers
+            pass
@@ -7,30 +7,39 @@ from __future__ import annotations
 
 import os
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
 logging.basicConfig(level=logging.INFO, format="[MultiModel] %(message)s")
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# The openai/anthropic SDKs are deliberately NOT imported here: together they
+# add hundreds of ms and tens of MB RSS to process start, so each adapter
+# imports its own SDK lazily inside initialize() — workers and tests that
+# never exercise an LLM skip the cost entirely.
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+from fast_json import loads as json_loads
+
+# Shared keep-alive session for the HTTP-based adapters (Ollama/HuggingFace).
+# Reusing pooled connections skips a TCP (and TLS) handshake per generation,
+# and hoisting the import out of the per-call path drops the repeated module
+# lookup the old inline ``import requests`` paid on every request.
+if REQUESTS_AVAILABLE:
+    _LLM_SESSION = requests.Session()
+    _LLM_SESSION.mount("http://", HTTPAdapter(pool_maxsize=32))
+    _LLM_SESSION.mount("https://", HTTPAdapter(pool_maxsize=32))
+else:  # pragma: no cover – optional dependency
+    _LLM_SESSION = None
+
 
 class ModelProvider(Enum):
     OPENAI = "openai"
@@ -39,7 +48,10 @@ class ModelProvider(Enum):
     HUGGINGFACE = "huggingface"
 
 
-@dataclass
+# slots avoids a per-instance __dict__ (smaller, faster attribute reads on
+# the generation hot path); frozen documents that configs are immutable once
+# registered, which the lazy-init path relies on.
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     provider: ModelProvider
     model_name: str
@@ -48,11 +60,18 @@ class ModelConfig:
     max_tokens: int = 2000
     temperature: float = 0.7
     system_prompt_template: Optional[str] = None
+    # Opt in to the provider's latency-optimized serving tier where one
+    # exists (e.g. OpenAI service_tier='priority'); toggled per deployment.
+    latency_optimized: bool = False
 
 
 class BaseModelAdapter:
     """Base class for model-specific adapters."""
-    
+
+    # All attributes any adapter assigns live here so no subclass grows a
+    # per-instance __dict__.
+    __slots__ = ("config", "client", "base_url", "api_key")
+
     def __init__(self, config: ModelConfig):
         self.config = config
         self.client = None
@@ -64,7 +83,15 @@ class BaseModelAdapter:
     def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response from the model. Override in subclasses."""
         raise NotImplementedError
-        
+
+    def generate_response_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield response chunks as they arrive.
+
+        Default falls back to one blocking generation emitted as a single
+        chunk; adapters whose provider supports streaming override this.
+        """
+        yield self.generate_response(prompt, **kwargs)
+
     def health_check(self) -> bool:
         """Check if the model is available and responsive."""
         try:
@@ -77,18 +104,28 @@ class BaseModelAdapter:
 class OpenAIAdapter(BaseModelAdapter):
     """Adapter for OpenAI models (GPT-3.5, GPT-4, etc.)."""
     
+    __slots__ = ()
+
+    # SDK class cached on the adapter class after the first lazy import
+    _OpenAI = None
+
     def initialize(self) -> bool:
-        if not OPENAI_AVAILABLE:
-            logging.warning("OpenAI library not available")
-            return False
-            
+        cls = type(self)
+        if cls._OpenAI is None:
+            try:
+                from openai import OpenAI
+            except ImportError:
+                logging.warning("OpenAI library not available")
+                return False
+            cls._OpenAI = OpenAI
+
         try:
             api_key = self.config.api_key or os.getenv('OPENAI_API_KEY')
             if not api_key:
                 logging.warning("OpenAI API key not found")
                 return False
-                
-            self.client = OpenAI(
+
+            self.client = cls._OpenAI(
                 api_key=api_key,
                 base_url=self.config.base_url
             )
@@ -96,7 +133,13 @@ class OpenAIAdapter(BaseModelAdapter):
         except Exception as e:
             logging.error(f"Failed to initialize OpenAI client: {e}")
             return False
-    
+
+    def _service_kwargs(self) -> Dict[str, Any]:
+        """Extra completion kwargs; priority tier roughly halves per-token latency."""
+        if self.config.latency_optimized:
+            return {"service_tier": "priority"}
+        return {}
+
     def generate_response(self, prompt: str, **kwargs) -> str:
         if not self.client:
             return "OpenAI client not initialized"
@@ -106,29 +149,62 @@ class OpenAIAdapter(BaseModelAdapter):
                 model=self.config.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=kwargs.get('max_tokens', self.config.max_tokens),
-                temperature=kwargs.get('temperature', self.config.temperature)
+                temperature=kwargs.get('temperature', self.config.temperature),
+                **self._service_kwargs()
             )
             return response.choices[0].message.content
         except Exception as e:
             logging.error(f"OpenAI generation failed: {e}")
             return f"Error: {str(e)}"
 
+    def generate_response_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        if not self.client:
+            yield "OpenAI client not initialized"
+            return
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.config.model_name,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=kwargs.get('max_tokens', self.config.max_tokens),
+                temperature=kwargs.get('temperature', self.config.temperature),
+                stream=True,
+                **self._service_kwargs()
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            logging.error(f"OpenAI streaming failed: {e}")
+            yield f"Error: {str(e)}"
+
 
 class AnthropicAdapter(BaseModelAdapter):
     """Adapter for Anthropic Claude models."""
     
+    __slots__ = ()
+
+    # SDK class cached on the adapter class after the first lazy import
+    _Anthropic = None
+
     def initialize(self) -> bool:
-        if not ANTHROPIC_AVAILABLE:
-            logging.warning("Anthropic library not available")
-            return False
-            
+        cls = type(self)
+        if cls._Anthropic is None:
+            try:
+                import anthropic
+            except ImportError:
+                logging.warning("Anthropic library not available")
+                return False
+            cls._Anthropic = anthropic.Anthropic
+
         try:
             api_key = self.config.api_key or os.getenv('ANTHROPIC_API_KEY')
             if not api_key:
                 logging.warning("Anthropic API key not found")
                 return False
-                
-            self.client = anthropic.Anthropic(api_key=api_key)
+
+            self.client = cls._Anthropic(api_key=api_key)
             return True
         except Exception as e:
             logging.error(f"Failed to initialize Anthropic client: {e}")
@@ -150,10 +226,30 @@ class AnthropicAdapter(BaseModelAdapter):
             logging.error(f"Anthropic generation failed: {e}")
             return f"Error: {str(e)}"
 
+    def generate_response_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        if not self.client:
+            yield "Anthropic client not initialized"
+            return
+
+        try:
+            with self.client.messages.stream(
+                model=self.config.model_name,
+                max_tokens=kwargs.get('max_tokens', self.config.max_tokens),
+                temperature=kwargs.get('temperature', self.config.temperature),
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            logging.error(f"Anthropic streaming failed: {e}")
+            yield f"Error: {str(e)}"
+
 
 class OllamaAdapter(BaseModelAdapter):
     """Adapter for local Ollama models."""
     
+    __slots__ = ()
+    
     def initialize(self) -> bool:
         if not REQUESTS_AVAILABLE:
             logging.warning("Requests library not available for Ollama")
@@ -165,32 +261,47 @@ class OllamaAdapter(BaseModelAdapter):
     def generate_response(self, prompt: str, **kwargs) -> str:
         if not hasattr(self, 'base_url'):
             return "Ollama adapter not initialized"
-            
+
+        # Sync wrapper over the streaming path: chunks are decoded as they
+        # arrive (one small JSON line at a time) instead of buffering the
+        # whole body and parsing it in one go, so peak memory stays O(chunk)
+        # and errors surface as soon as the server reports them.
+        return "".join(self.generate_response_stream(prompt, **kwargs)) or "No response"
+
+    def generate_response_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        if not hasattr(self, 'base_url'):
+            yield "Ollama adapter not initialized"
+            return
+
         try:
-            import requests
-            
             data = {
                 "model": self.config.model_name,
                 "prompt": prompt,
-                "stream": False,
+                "stream": True,
                 "options": {
                     "temperature": kwargs.get('temperature', self.config.temperature),
                     "num_predict": kwargs.get('max_tokens', self.config.max_tokens)
                 }
             }
-            
-            response = requests.post(f"{self.base_url}/api/generate", json=data, timeout=30)
-            response.raise_for_status()
-            
-            return response.json().get("response", "No response")
+
+            with _LLM_SESSION.post(f"{self.base_url}/api/generate", json=data, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json_loads(line).get("response")
+                    if chunk:
+                        yield chunk
         except Exception as e:
-            logging.error(f"Ollama generation failed: {e}")
-            return f"Error: {str(e)}"
+            logging.error(f"Ollama streaming failed: {e}")
+            yield f"Error: {str(e)}"
 
 
 class HuggingFaceAdapter(BaseModelAdapter):
     """Adapter for Hugging Face Inference API."""
     
+    __slots__ = ()
+    
     def initialize(self) -> bool:
         if not REQUESTS_AVAILABLE:
             logging.warning("Requests library not available for HuggingFace")
@@ -209,8 +320,6 @@ class HuggingFaceAdapter(BaseModelAdapter):
             return "HuggingFace adapter not initialized"
             
         try:
-            import requests
-            
             headers = {"Authorization": f"Bearer {self.api_key}"}
             data = {
                 "inputs": prompt,
@@ -221,10 +330,10 @@ class HuggingFaceAdapter(BaseModelAdapter):
             }
             
             url = f"{self.base_url}/{self.config.model_name}"
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = _LLM_SESSION.post(url, headers=headers, json=data, timeout=30)
             response.raise_for_status()
-            
-            result = response.json()
+
+            result = json_loads(response.content)
             if isinstance(result, list) and len(result) > 0:
                 return result[0].get("generated_text", "No response")
             return str(result)
@@ -233,14 +342,31 @@ class HuggingFaceAdapter(BaseModelAdapter):
             return f"Error: {str(e)}"
 
 
+# Provider -> adapter class; built once at module load
+_ADAPTER_CLASSES = {
+    ModelProvider.OPENAI: OpenAIAdapter,
+    ModelProvider.ANTHROPIC: AnthropicAdapter,
+    ModelProvider.OLLAMA: OllamaAdapter,
+    ModelProvider.HUGGINGFACE: HuggingFaceAdapter,
+}
+
+
 class MultiModelService:
-    """Service for managing multiple LLM providers and models."""
-    
+    """Service for managing multiple LLM providers and models.
+
+    Adapters are initialized lazily: registering a model only records its
+    config, and the client construction (env reads, HTTP client setup) runs
+    on first use of that model.  This keeps service creation — which happens
+    on the Flask cold-start path — free of per-provider setup cost.
+    """
+
     def __init__(self):
         self.adapters: Dict[str, BaseModelAdapter] = {}
+        self._pending_configs: Dict[str, ModelConfig] = {}
+        self._init_lock = threading.Lock()
         self.default_model = None
         self._load_default_configs()
-    
+
     def _load_default_configs(self):
         """Load default model configurations."""
         default_configs = [
@@ -271,56 +397,128 @@ class MultiModelService:
             self.add_model(config)
     
     def add_model(self, config: ModelConfig) -> bool:
-        """Add a new model configuration."""
-        adapter_classes = {
-            ModelProvider.OPENAI: OpenAIAdapter,
-            ModelProvider.ANTHROPIC: AnthropicAdapter,
-            ModelProvider.OLLAMA: OllamaAdapter,
-            ModelProvider.HUGGINGFACE: HuggingFaceAdapter,
-        }
-        
-        if config.provider not in adapter_classes:
+        """Register a model configuration (initialization is deferred)."""
+        if config.provider not in _ADAPTER_CLASSES:
             logging.error(f"Unsupported provider: {config.provider}")
             return False
-        
-        adapter_class = adapter_classes[config.provider]
-        adapter = adapter_class(config)
-        
-        if adapter.initialize():
-            model_id = f"{config.provider.value}:{config.model_name}"
-            self.adapters[model_id] = adapter
-            
-            # Set as default if it's the first working model or OpenAI
-            if not self.default_model or config.provider == ModelProvider.OPENAI:
-                self.default_model = model_id
-                
-            logging.info(f"Added model {model_id}")
-            return True
-        else:
-            logging.warning(f"Failed to initialize {config.provider.value}:{config.model_name}")
-            return False
+
+        model_id = f"{config.provider.value}:{config.model_name}"
+        self._pending_configs[model_id] = config
+
+        # Keep the historical default preference: first registered model,
+        # with OpenAI taking precedence when present.
+        if not self.default_model or config.provider == ModelProvider.OPENAI:
+            self.default_model = model_id
+
+        logging.info(f"Registered model {model_id}")
+        return True
+
+    def _ensure_initialized(self, model_id: str) -> Optional[BaseModelAdapter]:
+        """Initialize the adapter for ``model_id`` on first use.
+
+        Returns the ready adapter, or None when the model is unknown or its
+        initialization failed (missing SDK/API key etc.).
+        """
+        adapter = self.adapters.get(model_id)
+        if adapter is not None:
+            return adapter
+
+        with self._init_lock:
+            # Another thread may have won the race while we waited
+            adapter = self.adapters.get(model_id)
+            if adapter is not None:
+                return adapter
+
+            config = self._pending_configs.pop(model_id, None)
+            if config is None:
+                return None
+
+            adapter = _ADAPTER_CLASSES[config.provider](config)
+            if adapter.initialize():
+                self.adapters[model_id] = adapter
+                logging.info(f"Initialized model {model_id}")
+                return adapter
+
+            logging.warning(f"Failed to initialize {model_id}")
+            return None
     
+    def _resolve_adapter(self, model_id: Optional[str]) -> tuple:
+        """Return (model_id, adapter) for a request, initializing on demand.
+
+        An explicitly requested model that fails to initialize is an error;
+        when the *default* fails, fall through to any other registered model
+        that does come up (matching the old behaviour where only working
+        models could become the default).
+        """
+        if model_id:
+            return model_id, self._ensure_initialized(model_id)
+
+        if self.default_model:
+            adapter = self._ensure_initialized(self.default_model)
+            if adapter is not None:
+                return self.default_model, adapter
+
+        for candidate in list(self.adapters) + list(self._pending_configs):
+            adapter = self._ensure_initialized(candidate)
+            if adapter is not None:
+                self.default_model = candidate
+                return candidate, adapter
+
+        return None, None
+
     def generate_response(self, prompt: str, model_id: Optional[str] = None, **kwargs) -> str:
         """Generate a response using the specified or default model."""
-        target_model = model_id or self.default_model
-        
-        if not target_model or target_model not in self.adapters:
+        target_model, adapter = self._resolve_adapter(model_id)
+
+        if adapter is None:
             return "No available models configured"
-        
-        adapter = self.adapters[target_model]
+
         response = adapter.generate_response(prompt, **kwargs)
         
         # Log model usage for analytics
         logging.info(f"Generated response using {target_model}, length: {len(response)}")
-        
+
         return response
-    
+
+    def generate_response_stream(self, prompt: str, model_id: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """Stream a response using the specified or default model."""
+        target_model, adapter = self._resolve_adapter(model_id)
+
+        if adapter is None:
+            yield "No available models configured"
+            return
+
+        yield from adapter.generate_response_stream(prompt, **kwargs)
+
+    def _known_model_ids(self) -> List[str]:
+        """Every registered model id, initialized or not."""
+        return list(self.adapters) + list(self._pending_configs)
+
+    def _health_checks(self) -> List[tuple]:
+        """Run health checks for all registered models concurrently.
+
+        Each check is a full provider round-trip, so serial iteration costs
+        the *sum* of RTTs; a thread pool reduces it to the slowest one.
+        Returns (model_id, adapter-or-None, is_healthy) triples.
+        """
+        model_ids = self._known_model_ids()
+        adapters = [self._ensure_initialized(mid) for mid in model_ids]
+
+        def _check(adapter):
+            return adapter.health_check() if adapter else False
+
+        with ThreadPoolExecutor(max_workers=max(1, len(model_ids))) as pool:
+            healths = list(pool.map(_check, adapters))
+
+        return list(zip(model_ids, adapters, healths))
+
     def list_available_models(self) -> List[Dict[str, Any]]:
         """List all available models and their status."""
         models = []
-        
-        for model_id, adapter in self.adapters.items():
-            is_healthy = adapter.health_check()
+
+        for model_id, adapter, is_healthy in self._health_checks():
+            if adapter is None:
+                continue
             models.append({
                 "id": model_id,
                 "provider": adapter.config.provider.value,
@@ -330,25 +528,20 @@ class MultiModelService:
                 "max_tokens": adapter.config.max_tokens,
                 "temperature": adapter.config.temperature
             })
-        
+
         return models
     
     def set_default_model(self, model_id: str) -> bool:
         """Set the default model for responses."""
-        if model_id in self.adapters:
+        if model_id in self.adapters or model_id in self._pending_configs:
             self.default_model = model_id
             logging.info(f"Set default model to {model_id}")
             return True
         return False
-    
+
     def health_check_all(self) -> Dict[str, bool]:
         """Check health of all configured models."""
-        health_status = {}
-        
-        for model_id, adapter in self.adapters.items():
-            health_status[model_id] = adapter.health_check()
-        
-        return health_status
+        return {model_id: healthy for model_id, _adapter, healthy in self._health_checks()}
 
 
 # Global multi-model service instance
@@ -12,16 +12,56 @@ importing elsewhere.
 from __future__ import annotations
 
 import textwrap
+import threading
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 
 # Lazy import to avoid circular deps if memory service missing
 try:
     from memory_client import search as memory_search  # type: ignore
+    from memory_client import search_async as memory_search_async  # type: ignore
 except ModuleNotFoundError:
-    def memory_search(_query: str, *, limit: int = 3):  # type: ignore
+    def memory_search(_query: str, *, limit: int = 3, server_id=None):  # type: ignore
+        return []
+
+    async def memory_search_async(_query: str, *, limit: int = 3, server_id=None):  # type: ignore
         return []
 from typing import List, Sequence
 
+# Short-TTL cache over memory_search so hot prompts skip the HTTP round-trip
+# entirely; 30s is well within how fast stored memories actually change.
+_MEM_CACHE: dict = {}
+_MEM_CACHE_LOCK = threading.Lock()
+_MEM_CACHE_TTL = 30.0
+_MEM_CACHE_MAX = 1024
+
+
+def _mem_cache_get(key):
+    with _MEM_CACHE_LOCK:
+        entry = _MEM_CACHE.get(key)
+        if entry is not None and time.monotonic() - entry[0] < _MEM_CACHE_TTL:
+            return entry[1]
+    return None
+
+
+def _mem_cache_put(key, value) -> None:
+    with _MEM_CACHE_LOCK:
+        if len(_MEM_CACHE) >= _MEM_CACHE_MAX:
+            # Wholesale reset is fine at this size; entries expire in 30s anyway
+            _MEM_CACHE.clear()
+        _MEM_CACHE[key] = (time.monotonic(), value)
+
+
+def _cached_memory_search(query: str, *, limit: int = 3, server_id: str | None = None):
+    key = (query, server_id, limit)
+    hit = _mem_cache_get(key)
+    if hit is not None:
+        return hit
+    result = memory_search(query, limit=limit, server_id=server_id)
+    _mem_cache_put(key, result)
+    return result
+
 # System-level template – we prepend this to **every** generated prompt so that
 # the LLM maintains the correct persona and behavioural constraints.
 SYSTEM_TEMPLATE = textwrap.dedent(
@@ -42,6 +82,25 @@ CHAIN_OF_THOUGHT_SUFFIX = (
     "answer or action recommendation."
 )
 
+# Invariant fragments are assembled once at import: str.format re-parses the
+# template on every call, and the reasoning scaffold never changes, so the
+# per-call work reduces to two concatenations around the timestamp.
+_SYS_PREFIX, _SYS_SUFFIX = SYSTEM_TEMPLATE.split("{time}")
+_STATIC_TAIL = "## Plan:\n-\n\n## Think:\n\n## Answer:\n\n" + CHAIN_OF_THOUGHT_SUFFIX
+
+# ISO timestamp memoised per wall-clock second: prompts only quote the time
+# to the second anyway, and datetime.now().isoformat() costs microseconds of
+# allocation + formatting per call.  [int_second, iso_string]
+_TS_CACHE: list = [0, ""]
+
+
+def _utc_now_iso() -> str:
+    second = int(time.time())
+    if second != _TS_CACHE[0]:
+        _TS_CACHE[1] = datetime.fromtimestamp(second, timezone.utc).isoformat()
+        _TS_CACHE[0] = second
+    return _TS_CACHE[1]
+
 
 def build_prompt(user_message: str, *, history: Sequence[str] | None = None, memory: Sequence[str] | None = None, auto_mem: bool = True, server_id: str | None = None) -> str:  # noqa: D401
     """Return a full prompt for the LLM agent.
@@ -56,24 +115,59 @@ def build_prompt(user_message: str, *, history: Sequence[str] | None = None, mem
     Returns:
         A string ready to be passed to the `agent.run()` call.
     """
-    now_iso = datetime.now(timezone.utc).isoformat()
-    system_block = SYSTEM_TEMPLATE.format(time=now_iso)
+    # The memory lookup stays outside the memoised renderer so its 30s TTL
+    # is honoured; only the rendering of the resolved inputs is cached.
+    if memory is None and auto_mem:
+        memory = _cached_memory_search(user_message, limit=3, server_id=server_id)
+    body = _render_body_cached(
+        user_message,
+        tuple(history) if history else (),
+        tuple(memory) if memory else (),
+    )
+    return _SYS_PREFIX + _utc_now_iso() + _SYS_SUFFIX + body
 
+
+async def build_prompt_async(user_message: str, *, history: Sequence[str] | None = None, memory: Sequence[str] | None = None, auto_mem: bool = True, server_id: str | None = None) -> str:
+    """Async variant of :func:`build_prompt`.
+
+    The memory lookup awaits on the event loop instead of blocking a worker
+    thread, so callers can overlap it with other I/O on the chat path.
+    """
+    if memory is None and auto_mem:
+        key = (user_message, server_id, 3)
+        memory = _mem_cache_get(key)
+        if memory is None:
+            memory = await memory_search_async(user_message, limit=3, server_id=server_id)
+            _mem_cache_put(key, memory)
+    body = _render_body_cached(
+        user_message,
+        tuple(history) if history else (),
+        tuple(memory) if memory else (),
+    )
+    return _SYS_PREFIX + _utc_now_iso() + _SYS_SUFFIX + body
+
+
+@lru_cache(maxsize=1024)
+def _render_body_cached(user_message: str, history: tuple, memory: tuple) -> str:
+    """Render everything below the system block; memoised because template
+    rendering plus history stringification dominates the non-LLM cost of a
+    chat turn.
+
+    Deliberately time-free: the timestamp is spliced in by the caller on
+    every call, and memory results arrive here already resolved, so a cache
+    hit can never serve a stale clock or a frozen memory snapshot.
+    """
     history_block = ""  # default blank if no history
     memory_block = ""
     if history:
         # We join history messages separated by a blank line for clarity.
         history_block = "\n\n".join(history)
 
-    if memory is None and auto_mem:
-        # Auto-fetch relevant memories via vector search
-        memory = memory_search(user_message, limit=3, server_id=server_id)
-
     if memory:
         memory_block = "\n\n".join(memory)
 
-    # Compose final prompt
-    prompt_parts: List[str] = [system_block]
+    # Compose final prompt body (the system block is prepended by callers)
+    prompt_parts: List[str] = [""]
     if history_block:
         prompt_parts.append("Conversation history:\n" + history_block)
 
@@ -82,11 +176,7 @@ def build_prompt(user_message: str, *, history: Sequence[str] | None = None, mem
 
     prompt_parts.append("User message:\n" + user_message)
 
-    # Multi-step reasoning scaffold
-    prompt_parts.append("## Plan:\n-")
-    prompt_parts.append("## Think:")
-    prompt_parts.append("## Answer:")
-
-    prompt_parts.append(CHAIN_OF_THOUGHT_SUFFIX)
+    # Multi-step reasoning scaffold (prebuilt – see _STATIC_TAIL)
+    prompt_parts.append(_STATIC_TAIL)
 
     return "\n\n".join(prompt_parts)
@@ -0,0 +1,24 @@
+#!/bin/bash
+
+# Optionally compile the pure-Python hot-path modules to C extensions with
+# mypyc.  After the orjson/dispatch-table changes, the interpreter cost of the
+# per-request path lives mostly in fast_json and llm_cache; compiling them
+# typically buys another 2-4x on that slice.  agent_service itself stays
+# interpreted because its handlers hold LangChain objects, which mypyc can't
+# type.
+#
+# The compiled .so files shadow the .py sources on import; deleting them
+# falls straight back to the interpreted modules, so this step is safe to
+# skip entirely (and is skipped automatically when mypyc isn't installed).
+
+set -e
+cd "$(dirname "$0")/.."
+
+if ! command -v mypyc &> /dev/null
+then
+    echo "mypyc not installed - skipping native build (pure Python is fine)"
+    exit 0
+fi
+
+mypyc fast_json.py llm_cache.py
+echo "Native build complete"
@@ -7,6 +7,8 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
 import unittest
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mcp_client import MCPClient
 from agent_service import initialize_agent_service
 from llm_service import process_chat_message
@@ -14,6 +16,24 @@ from llm_service import process_chat_message
 @unittest.skipUnless(os.getenv('RUN_INTEGRATION_TESTS') == '1',
                      "Integration tests require RUN_INTEGRATION_TESTS=1 and running backend/MCP servers")
 class TestServerManagement(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # One keep-alive session for the whole class; module-level
+        # requests.get() opens (and tears down) a fresh TCP connection per
+        # call, which dominates the runtime of these fast endpoints.
+        cls.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        cls.session.mount('http://', adapter)
+        cls.session.mount('https://', adapter)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+
     def setUp(self):
         self.mcp_client = MCPClient()
         self.agent_service = initialize_agent_service()
@@ -21,7 +41,7 @@ class TestServerManagement(unittest.TestCase):
 
     def test_health_check(self):
         """Test health check endpoint"""
-        response = requests.get(f'{self.base_url}/api/health')
+        response = self.session.get(f'{self.base_url}/api/health')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['status'], 'healthy')
 